@@ -4,18 +4,33 @@ Unlisted Edge AI Service
 Python-based AI layer for trading insights and predictions
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request
 from flask_cors import CORS
-import pandas as pd
+import msgspec
 import numpy as np
-from datetime import datetime, timedelta
-import joblib
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, List
 import os
+import random
+import time
 import logging
-import uuid
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
+import secrets
+import sys
 import warnings
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; batch scoring falls back to plain NumPy
+    njit = None
+
+try:
+    from diskcache import Cache
+except ImportError:  # diskcache is optional; insights are then never memoized
+    Cache = None
 
 warnings.filterwarnings('ignore')
 
@@ -26,6 +41,322 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
+# Sector-based analysis weights as parallel arrays indexed by sector code
+# (float64 keeps threshold checks such as growth * 100 > 70 exact)
+_SECTOR_CODE = {
+    'Technology': 0,
+    'Healthcare': 1,
+    'Finance': 2,
+    'Education': 3,
+    'E-commerce': 4,
+    'default': 5
+}
+_DEFAULT_SECTOR_CODE = _SECTOR_CODE['default']
+_GROWTH = np.array([0.8, 0.7, 0.6, 0.7, 0.9, 0.6])
+_STABILITY = np.array([0.6, 0.8, 0.9, 0.7, 0.5, 0.7])
+_RISK = np.array([0.7, 0.5, 0.6, 0.6, 0.8, 0.6])
+
+# Key factor pools per sector
+_FACTOR_POOLS = {
+    'Technology': (
+        'Strong innovation pipeline and R&D investment',
+        'Market leadership in emerging technologies',
+        'Scalable business model with network effects',
+        'High customer retention and engagement metrics',
+        'Competitive moat through proprietary technology'
+    ),
+    'Healthcare': (
+        'Robust clinical trial pipeline',
+        'Regulatory approval momentum',
+        'Strong intellectual property portfolio',
+        'Growing addressable market size',
+        'Strategic partnerships with healthcare providers'
+    ),
+    'Finance': (
+        'Strong capital adequacy ratios',
+        'Diversified revenue streams',
+        'Digital transformation progress',
+        'Regulatory compliance excellence',
+        'Market share expansion in key segments'
+    ),
+    'Education': (
+        'Growing digital adoption trends',
+        'Strong brand recognition and trust',
+        'Scalable online delivery platform',
+        'International expansion opportunities',
+        'Government policy support for education'
+    ),
+    'default': (
+        'Strong market position in sector',
+        'Consistent revenue growth trajectory',
+        'Effective cost management strategies',
+        'Experienced management team',
+        'Favorable industry dynamics'
+    )
+}
+_DEFAULT_FACTORS = _FACTOR_POOLS['default']
+
+# Recommendations indexed by the codes returned from the batch scoring kernel;
+# every insight reuses these interned string objects
+_RECOMMENDATIONS = tuple(sys.intern(name) for name in ('BUY', 'HOLD', 'SELL', 'WATCH'))
+_BUY, _HOLD, _SELL, _WATCH = _RECOMMENDATIONS
+
+def _score_batch_numpy(codes, prices, normals):
+    """Score a batch of companies, returning confidence scores and recommendation codes"""
+    growth_scores = _GROWTH[codes] * 100
+    stability = _STABILITY[codes]
+    risk_scores = _RISK[codes] * 100
+    
+    confidence_scores = np.clip(
+        # fmin, like the builtin min, ignores a NaN price ratio instead of propagating it
+        normals + stability * 10 + np.fmin(10, 100 / prices) * 5, 50, 95
+    )
+    recommendations = np.select(
+        [
+            (confidence_scores > 80) & (growth_scores > 70),
+            (confidence_scores > 65) & (risk_scores < 60),
+            risk_scores > 80
+        ],
+        [0, 1, 2],
+        default=3
+    ).astype(np.int8)
+    return confidence_scores.astype(np.int32), recommendations
+
+def _score_batch_loop(codes, prices, normals):
+    """Same scoring as _score_batch_numpy written as a loop for numba to compile"""
+    count = codes.shape[0]
+    confidence_out = np.empty(count, dtype=np.int32)
+    recommendation_out = np.empty(count, dtype=np.int8)
+    for i in range(count):
+        code = codes[i]
+        growth_score = _GROWTH[code] * 100
+        risk_score = _RISK[code] * 100
+        confidence = normals[i] + _STABILITY[code] * 10 + min(10.0, 100 / prices[i]) * 5
+        confidence = max(50.0, min(95.0, confidence))
+        
+        if confidence > 80 and growth_score > 70:
+            recommendation = 0
+        elif confidence > 65 and risk_score < 60:
+            recommendation = 1
+        elif risk_score > 80:
+            recommendation = 2
+        else:
+            recommendation = 3
+        
+        confidence_out[i] = int(confidence)
+        recommendation_out[i] = recommendation
+    return confidence_out, recommendation_out
+
+if njit is not None:
+    # cache=True keeps the compiled kernel on disk across restarts. The kernel
+    # stays serial: gthread workers may call it from several threads at once,
+    # which numba's workqueue threading layer aborts on, and batches are too
+    # small for parallel dispatch to pay off anyway
+    _score_batch = njit(cache=True)(_score_batch_loop)
+else:
+    _score_batch = _score_batch_numpy
+
+# Insight text per recommendation, split around the symbol and sector so
+# rendering is a single str.join of the selected fragments
+_INSIGHT_TEMPLATES = {
+    _BUY: (
+        "",
+        " shows strong AI-analyzed fundamentals with high growth potential in the ",
+        " sector. Machine learning models indicate favorable market conditions and positive sentiment indicators."
+    ),
+    _HOLD: (
+        "",
+        " demonstrates stable performance metrics according to our AI analysis. The ",
+        " sector shows moderate growth with balanced risk-reward ratio suitable for long-term holding."
+    ),
+    _SELL: (
+        "AI risk assessment for ",
+        " indicates elevated volatility in the ",
+        " sector. Predictive models suggest potential downward pressure with increased market uncertainty."
+    ),
+    _WATCH: (
+        "",
+        " presents mixed signals in our AI analysis. The ",
+        " sector requires careful monitoring as machine learning models show conflicting trend indicators."
+    )
+}
+
+# Market sentiment labels ordered by score band, split at _SENTIMENT_THRESHOLDS
+_SENTIMENT_THRESHOLDS = (-0.3, 0.3)
+_SENTIMENT_LABELS = (
+    (sys.intern('Bearish'), 'AI analysis suggests cautious market conditions with risk-off sentiment'),
+    (sys.intern('Neutral'), 'Market shows balanced sentiment with mixed signals from AI indicators'),
+    (sys.intern('Bullish'), 'AI models indicate positive market momentum with strong investor confidence')
+)
+_SENTIMENT_FACTORS = (
+    'Technical indicator analysis',
+    'News sentiment processing',
+    'Trading volume patterns',
+    'Sector rotation analysis',
+    'Global market correlation'
+)
+
+# Shared random generator; the legacy np.random module API is much slower per draw
+_rng = np.random.default_rng()
+
+class _RandomPool:
+    """Pre-drawn random values handed out one at a time and refilled in bulk.
+
+    Drawing single scalars from NumPy costs far more in call overhead than in
+    the actual sampling, so each stream is generated ``size`` values at a time.
+    """
+
+    def __init__(self, rng=_rng, size=8192):
+        self.size = size
+        self._fillers = {
+            'confidence': lambda n: rng.normal(75, 10, n),
+            'data_points': lambda n: rng.integers(500, 2000, n),
+            'processing_ms': lambda n: rng.integers(150, 500, n),
+            'sentiment': lambda n: rng.normal(0.6, 0.2, n),
+            'sentiment_confidence': lambda n: rng.integers(70, 95, n)
+        }
+        self._buffers = {name: [] for name in self._fillers}
+
+    def fill(self):
+        """Pre-draw every stream so the first requests skip the refill"""
+        for name, buffer in self._buffers.items():
+            if not buffer:
+                buffer.extend(self._fillers[name](self.size).tolist())
+
+    def _next(self, name):
+        buffer = self._buffers[name]
+        try:
+            return buffer.pop()
+        except IndexError:
+            buffer.extend(self._fillers[name](self.size).tolist())
+            return buffer.pop()
+
+    def next_normal(self):
+        """Base confidence draw, N(75, 10)"""
+        return self._next('confidence')
+
+    def next_data_points(self):
+        return self._next('data_points')
+
+    def next_processing_ms(self):
+        return self._next('processing_ms')
+
+    def next_sentiment(self):
+        """Market sentiment draw, N(0.6, 0.2)"""
+        return self._next('sentiment')
+
+    def next_sentiment_confidence(self):
+        return self._next('sentiment_confidence')
+
+_random_pool = _RandomPool()
+
+# Formatted timestamp and the monotonic time it was taken at
+_timestamp_cache = ('', float('-inf'))
+
+def _now_iso():
+    """Current time as an ISO string, refreshed at most once per second"""
+    global _timestamp_cache
+    timestamp, taken_at = _timestamp_cache
+    now = time.monotonic()
+    if now - taken_at >= 1.0:
+        timestamp = datetime.now().isoformat()
+        _timestamp_cache = (timestamp, now)
+    return timestamp
+
+class CompanyIn(msgspec.Struct):
+    """Company payload accepted by the insight endpoints
+
+    Fields are deliberately loose: clients send ids, symbols and sectors of
+    any JSON type (or null) and prices as numbers or numeric strings, and all
+    of these have always produced an insight. Missing fields stay UNSET so an
+    empty payload can be told apart; defaults are applied in _parse_company.
+    """
+    id: Any = msgspec.UNSET
+    symbol: Any = msgspec.UNSET
+    current_price: Any = msgspec.UNSET
+    sector: Any = msgspec.UNSET
+
+class BatchIn(msgspec.Struct):
+    """Batch payload; companies stay encoded so each is decoded (and skipped) on its own"""
+    companies: List[msgspec.Raw] = []
+
+_EMPTY_COMPANY = CompanyIn()
+_company_decoder = msgspec.json.Decoder(CompanyIn)
+_batch_decoder = msgspec.json.Decoder(BatchIn)
+
+class AIMetadata(msgspec.Struct):
+    model_version: str
+    analysis_type: str
+    data_points_analyzed: int
+    processing_time_ms: int
+
+class Insight(msgspec.Struct):
+    """AI insight returned for a single company"""
+    id: str
+    company_id: Any
+    company_name: str
+    symbol: Any
+    insight_text: str
+    confidence_score: int
+    recommendation: str
+    date_generated: str
+    key_factors: List[str]
+    ai_metadata: AIMetadata
+
+_json_encoder = msgspec.json.Encoder()
+
+def _jsonify(obj, status=200):
+    """JSON response encoded with msgspec, which also serializes Structs natively"""
+    return app.response_class(
+        _json_encoder.encode(obj),
+        status=status,
+        mimetype='application/json'
+    )
+
+# Optional process pool for very large batches; disabled by default since
+# gunicorn already runs one worker per CPU
+_BATCH_WORKERS = int(os.environ.get('AI_BATCH_WORKERS', 0))
+_BATCH_CHUNK_SIZE = 256
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+def _get_batch_pool():
+    """Create the batch process pool on first use"""
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is None:
+            # spawn rather than fork: gthread workers are multithreaded and
+            # forking a threaded process is not safe
+            _batch_pool = ProcessPoolExecutor(
+                max_workers=_BATCH_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+    return _batch_pool
+
+def _analyze_batch_chunk(companies):
+    """Run one chunk of a batch inside a pool worker"""
+    return ai_engine.generate_batch_insights(companies)
+
+# Insights for the same company, sector and price are reused for a few minutes
+_INSIGHT_CACHE_TTL = 300
+# Kept inside the service directory rather than a shared temp dir so other
+# users cannot plant entries in it
+_DEFAULT_INSIGHT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '.insight-cache'
+)
+
+def _open_insight_cache():
+    """Open the on-disk insight cache, or return None if it is unavailable"""
+    if Cache is None:
+        return None
+    try:
+        return Cache(os.environ.get('AI_INSIGHT_CACHE_DIR', _DEFAULT_INSIGHT_CACHE_DIR))
+    except Exception as e:
+        logger.warning(f"Insight cache disabled: {str(e)}")
+        return None
+
+_insight_cache = _open_insight_cache()
+
 # AI engine will be initialized globally
 
 class AIInsightEngine:
@@ -36,26 +367,46 @@ class AIInsightEngine:
     
     def initialize_models(self):
         """Initialize AI models for different predictions"""
+        global _score_batch
         try:
             # Note: Models are initialized but not trained in this demo version
             # In production, load pre-trained models or implement training pipeline
+            
+            # Warm up the hot paths so the first request is not a cold-start outlier
+            _random_pool.fill()
+            if _score_batch is not _score_batch_numpy:
+                # Compiles the batch kernel, or loads it from numba's on-disk cache
+                try:
+                    _score_batch(np.zeros(1, dtype=np.intp), np.ones(1), np.zeros(1))
+                except Exception as e:
+                    logger.error(f"❌ Batch kernel compilation failed, using NumPy scoring: {str(e)}")
+                    _score_batch = _score_batch_numpy
+            company_id, symbol, _, sector = self._parse_company(_company_decoder.decode(b'{}'))
+            _json_encoder.encode(self._build_insight(
+                '', company_id, symbol, sector, 0, _WATCH, [], 0, 0
+            ))
+            
             logger.info("✅ AI models initialized successfully")
             
         except Exception as e:
             logger.error(f"❌ Model initialization failed: {str(e)}")
     
-    def generate_company_insight(self, company_data):
-        """Generate AI insights for a specific company"""
+    def generate_company_insight(self, company):
+        """Generate AI insights for a decoded CompanyIn, as pre-encoded JSON"""
         try:
-            company_id = company_data.get('id', 1)
-            symbol = company_data.get('symbol', 'UNKNOWN')
-            current_price = float(company_data.get('current_price', 100))
-            sector = company_data.get('sector', 'Technology')
+            company_id, symbol, current_price, sector = self._parse_company(company)
             
-            # Simulate AI analysis with realistic factors
-            insights = self._analyze_company_fundamentals(
-                company_id, symbol, current_price, sector
-            )
+            # Keys and values are JSON bytes, which diskcache stores raw
+            # instead of pickling
+            cache_key = _json_encoder.encode((company_id, symbol, sector, round(current_price, 2)))
+            insights = self._get_cached_insight(cache_key)
+            
+            if insights is None:
+                # Simulate AI analysis with realistic factors
+                insights = msgspec.Raw(self._store_cached_insight(
+                    cache_key,
+                    self._analyze_company_fundamentals(company_id, symbol, current_price, sector)
+                ))
             
             return {
                 'success': True,
@@ -69,24 +420,90 @@ class AIInsightEngine:
                 'error': str(e)
             }
     
+    def generate_batch_insights(self, companies):
+        """Generate AI insights for many JSON-encoded companies with vectorized scoring"""
+        parsed = []
+        for company_json in companies:
+            try:
+                company_id, symbol, current_price, sector = self._parse_company(
+                    _company_decoder.decode(company_json)
+                )
+                if current_price == 0:
+                    raise ZeroDivisionError('float division by zero')
+                # Resolved here so an unhashable sector only skips this company
+                code = _SECTOR_CODE.get(sector, _DEFAULT_SECTOR_CODE)
+                parsed.append((company_id, symbol, current_price, sector, code))
+            except Exception as e:
+                logger.error(f"Insight generation failed: {str(e)}")
+        
+        count = len(parsed)
+        if not count:
+            return []
+        
+        codes = np.fromiter((code for _, _, _, _, code in parsed), dtype=np.intp, count=count)
+        prices = np.fromiter((price for _, _, price, _, _ in parsed), dtype=np.float64, count=count)
+        
+        # Same confidence and recommendation rules as the single-company path
+        confidence_scores, recommendation_codes = _score_batch(
+            codes, prices, _rng.normal(75, 10, count)
+        )
+        confidence_scores = confidence_scores.tolist()
+        recommendations = [_RECOMMENDATIONS[code] for code in recommendation_codes.tolist()]
+        data_points = _rng.integers(500, 2000, count).tolist()
+        processing_times = _rng.integers(150, 500, count).tolist()
+        # One urandom read for all insight ids, 32 hex chars each
+        ids_hex = os.urandom(16 * count).hex()
+        
+        insights = []
+        for i, (company_id, symbol, current_price, sector, _) in enumerate(parsed):
+            insights.append(self._build_insight(
+                ids_hex[32 * i:32 * (i + 1)], company_id, symbol, sector, confidence_scores[i], recommendations[i],
+                self._generate_key_factors(sector, current_price),
+                data_points[i], processing_times[i]
+            ))
+        
+        return insights
+    
+    def _get_cached_insight(self, cache_key):
+        """Return a memoized insight as pre-encoded JSON, or None on a miss or cache failure"""
+        if _insight_cache is None:
+            return None
+        try:
+            cached = _insight_cache.get(cache_key)
+            return msgspec.Raw(cached) if isinstance(cached, bytes) else None
+        except Exception as e:
+            logger.warning(f"Insight cache read failed: {str(e)}")
+            return None
+    
+    def _store_cached_insight(self, cache_key, insights):
+        """Encode an insight once, memoize the bytes and return them for the response"""
+        encoded = _json_encoder.encode(insights)
+        if _insight_cache is not None:
+            try:
+                _insight_cache.set(cache_key, encoded, expire=_INSIGHT_CACHE_TTL)
+            except Exception as e:
+                logger.warning(f"Insight cache write failed: {str(e)}")
+        return encoded
+    
+    def _parse_company(self, company):
+        """Extract the fields used for analysis, applying defaults for missing ones"""
+        current_price = company.current_price
+        return (
+            1 if company.id is msgspec.UNSET else company.id,
+            'UNKNOWN' if company.symbol is msgspec.UNSET else company.symbol,
+            # float() also accepts numeric strings, e.g. DECIMAL prices from Postgres
+            float(100 if current_price is msgspec.UNSET else current_price),
+            'Technology' if company.sector is msgspec.UNSET else company.sector
+        )
+    
     def _analyze_company_fundamentals(self, company_id, symbol, price, sector):
         """Analyze company fundamentals using AI algorithms"""
         
-        # Sector-based analysis weights
-        sector_weights = {
-            'Technology': {'growth': 0.8, 'stability': 0.6, 'risk': 0.7},
-            'Healthcare': {'growth': 0.7, 'stability': 0.8, 'risk': 0.5},
-            'Finance': {'growth': 0.6, 'stability': 0.9, 'risk': 0.6},
-            'Education': {'growth': 0.7, 'stability': 0.7, 'risk': 0.6},
-            'E-commerce': {'growth': 0.9, 'stability': 0.5, 'risk': 0.8},
-            'default': {'growth': 0.6, 'stability': 0.7, 'risk': 0.6}
-        }
-        
-        weights = sector_weights.get(sector, sector_weights['default'])
+        code = _SECTOR_CODE.get(sector, _DEFAULT_SECTOR_CODE)
         
         # AI-based confidence calculation
-        base_confidence = np.random.normal(75, 10)
-        sector_adjustment = weights['stability'] * 10
+        base_confidence = _random_pool.next_normal()
+        sector_adjustment = _STABILITY[code] * 10
         price_stability = min(10, 100 / price) * 5
         
         confidence_score = max(50, min(95, 
@@ -94,94 +511,56 @@ class AIInsightEngine:
         ))
         
         # AI recommendation logic
-        growth_score = weights['growth'] * 100
-        risk_score = weights['risk'] * 100
+        growth_score = _GROWTH[code] * 100
+        risk_score = _RISK[code] * 100
         
         if confidence_score > 80 and growth_score > 70:
-            recommendation = 'BUY'
+            recommendation = _BUY
         elif confidence_score > 65 and risk_score < 60:
-            recommendation = 'HOLD'
+            recommendation = _HOLD
         elif risk_score > 80:
-            recommendation = 'SELL'
+            recommendation = _SELL
         else:
-            recommendation = 'WATCH'
-        
-        # Generate AI insights text
-        insight_templates = {
-            'BUY': f"{symbol} shows strong AI-analyzed fundamentals with high growth potential in the {sector} sector. Machine learning models indicate favorable market conditions and positive sentiment indicators.",
-            'HOLD': f"{symbol} demonstrates stable performance metrics according to our AI analysis. The {sector} sector shows moderate growth with balanced risk-reward ratio suitable for long-term holding.",
-            'SELL': f"AI risk assessment for {symbol} indicates elevated volatility in the {sector} sector. Predictive models suggest potential downward pressure with increased market uncertainty.",
-            'WATCH': f"{symbol} presents mixed signals in our AI analysis. The {sector} sector requires careful monitoring as machine learning models show conflicting trend indicators."
-        }
+            recommendation = _WATCH
         
         # AI-generated key factors
-        key_factors = self._generate_key_factors(sector, weights, price)
+        key_factors = self._generate_key_factors(sector, price)
         
-        return {
-            'id': str(uuid.uuid4()),
-            'company_id': company_id,
-            'company_name': f"{symbol} Analysis",
-            'symbol': symbol,
-            'insight_text': insight_templates[recommendation],
-            'confidence_score': int(confidence_score),
-            'recommendation': recommendation,
-            'date_generated': datetime.now().isoformat(),
-            'key_factors': key_factors,
-            'ai_metadata': {
-                'model_version': '2.1.0',
-                'analysis_type': 'fundamental_technical_hybrid',
-                'data_points_analyzed': int(np.random.randint(500, 2000)),
-                'processing_time_ms': int(np.random.randint(150, 500))
-            }
-        }
+        return self._build_insight(
+            secrets.token_hex(16), company_id, symbol, sector, int(confidence_score),
+            recommendation, key_factors,
+            _random_pool.next_data_points(), _random_pool.next_processing_ms()
+        )
+    
+    def _build_insight(self, insight_id, company_id, symbol, sector, confidence_score,
+                       recommendation, key_factors, data_points, processing_ms):
+        """Assemble the insight payload returned to API clients"""
+        prefix, middle, suffix = _INSIGHT_TEMPLATES[recommendation]
+        return Insight(
+            id=insight_id,
+            company_id=company_id,
+            company_name=f"{symbol} Analysis",
+            symbol=symbol,
+            insight_text=''.join((prefix, str(symbol), middle, str(sector), suffix)),
+            confidence_score=confidence_score,
+            recommendation=recommendation,
+            date_generated=_now_iso(),
+            key_factors=key_factors,
+            ai_metadata=AIMetadata(
+                model_version='2.1.0',
+                analysis_type='fundamental_technical_hybrid',
+                data_points_analyzed=data_points,
+                processing_time_ms=processing_ms
+            )
+        )
     
-    def _generate_key_factors(self, sector, weights, price):
+    def _generate_key_factors(self, sector, price):
         """Generate AI-based key factors for analysis"""
         
-        factor_pools = {
-            'Technology': [
-                'Strong innovation pipeline and R&D investment',
-                'Market leadership in emerging technologies',
-                'Scalable business model with network effects',
-                'High customer retention and engagement metrics',
-                'Competitive moat through proprietary technology'
-            ],
-            'Healthcare': [
-                'Robust clinical trial pipeline',
-                'Regulatory approval momentum',
-                'Strong intellectual property portfolio',
-                'Growing addressable market size',
-                'Strategic partnerships with healthcare providers'
-            ],
-            'Finance': [
-                'Strong capital adequacy ratios',
-                'Diversified revenue streams',
-                'Digital transformation progress',
-                'Regulatory compliance excellence',
-                'Market share expansion in key segments'
-            ],
-            'Education': [
-                'Growing digital adoption trends',
-                'Strong brand recognition and trust',
-                'Scalable online delivery platform',
-                'International expansion opportunities',
-                'Government policy support for education'
-            ],
-            'default': [
-                'Strong market position in sector',
-                'Consistent revenue growth trajectory',
-                'Effective cost management strategies',
-                'Experienced management team',
-                'Favorable industry dynamics'
-            ]
-        }
-        
-        factors = factor_pools.get(sector, factor_pools['default'])
+        factors = _FACTOR_POOLS.get(sector, _DEFAULT_FACTORS)
         
         # AI selects most relevant factors based on weights
-        selected_factors = np.random.choice(factors, size=min(5, len(factors)), replace=False)
-        
-        return selected_factors.tolist()
+        return random.sample(factors, k=min(5, len(factors)))
 
 # Initialize AI engine
 ai_engine = AIInsightEngine()
@@ -189,37 +568,42 @@ ai_engine = AIInsightEngine()
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return _jsonify({
         'status': 'healthy',
         'service': 'Unlisted Edge AI Service',
         'version': '2.1.0',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': _now_iso()
     })
 
 @app.route('/ai/insight', methods=['POST'])
 def generate_insight():
     """Generate AI insight for a company"""
     try:
-        company_data = request.get_json()
+        body = request.get_data()
+        try:
+            company = _company_decoder.decode(body) if body else None
+        except msgspec.ValidationError:
+            # Valid JSON that is not an object (null, a list, ...)
+            company = None
         
-        if not company_data:
-            return jsonify({
+        if company is None or company == _EMPTY_COMPANY:
+            return _jsonify({
                 'success': False,
                 'error': 'No company data provided'
             }), 400
         
-        result = ai_engine.generate_company_insight(company_data)
+        result = ai_engine.generate_company_insight(company)
         
         if result['success']:
-            return jsonify(result['insight'])
+            return _jsonify(result['insight'])
         else:
-            return jsonify({
+            return _jsonify({
                 'error': result['error']
             }), 500
             
     except Exception as e:
         logger.error(f"API error: {str(e)}")
-        return jsonify({
+        return _jsonify({
             'error': 'Internal server error'
         }), 500
 
@@ -227,22 +611,29 @@ def generate_insight():
 def batch_analysis():
     """Analyze multiple companies in batch"""
     try:
-        data = request.get_json()
-        companies = data.get('companies', [])
+        body = request.get_data()
+        companies = _batch_decoder.decode(body).companies if body else []
         
         if not companies:
-            return jsonify({
+            return _jsonify({
                 'success': False,
                 'error': 'No companies provided'
             }), 400
         
-        results = []
-        for company in companies:
-            insight = ai_engine.generate_company_insight(company)
-            if insight['success']:
-                results.append(insight['insight'])
+        if _BATCH_WORKERS > 0 and len(companies) > _BATCH_CHUNK_SIZE:
+            chunks = [
+                companies[i:i + _BATCH_CHUNK_SIZE]
+                for i in range(0, len(companies), _BATCH_CHUNK_SIZE)
+            ]
+            results = [
+                insight
+                for chunk_results in _get_batch_pool().map(_analyze_batch_chunk, chunks)
+                for insight in chunk_results
+            ]
+        else:
+            results = ai_engine.generate_batch_insights(companies)
         
-        return jsonify({
+        return _jsonify({
             'success': True,
             'insights': results,
             'processed_count': len(results)
@@ -250,7 +641,7 @@ def batch_analysis():
         
     except Exception as e:
         logger.error(f"Batch analysis error: {str(e)}")
-        return jsonify({
+        return _jsonify({
             'error': 'Batch analysis failed'
         }), 500
 
@@ -259,37 +650,26 @@ def market_sentiment():
     """Get overall market sentiment analysis"""
     try:
         # AI-generated market sentiment
-        sentiment_score = np.random.normal(0.6, 0.2)  # Slightly positive bias
+        sentiment_score = _random_pool.next_sentiment()  # Slightly positive bias
         sentiment_score = max(-1, min(1, sentiment_score))
         
-        if sentiment_score > 0.3:
-            sentiment = 'Bullish'
-            description = 'AI models indicate positive market momentum with strong investor confidence'
-        elif sentiment_score > -0.3:
-            sentiment = 'Neutral'
-            description = 'Market shows balanced sentiment with mixed signals from AI indicators'
-        else:
-            sentiment = 'Bearish'
-            description = 'AI analysis suggests cautious market conditions with risk-off sentiment'
+        # Above 0.3 is Bullish, above -0.3 Neutral, otherwise Bearish
+        sentiment, description = _SENTIMENT_LABELS[
+            bisect_left(_SENTIMENT_THRESHOLDS, sentiment_score)
+        ]
         
-        return jsonify({
+        return _jsonify({
             'sentiment': sentiment,
             'score': round(sentiment_score, 3),
             'description': description,
-            'confidence': int(np.random.randint(70, 95)),
-            'timestamp': datetime.now().isoformat(),
-            'factors': [
-                'Technical indicator analysis',
-                'News sentiment processing',
-                'Trading volume patterns',
-                'Sector rotation analysis',
-                'Global market correlation'
-            ]
+            'confidence': _random_pool.next_sentiment_confidence(),
+            'timestamp': _now_iso(),
+            'factors': _SENTIMENT_FACTORS
         })
         
     except Exception as e:
         logger.error(f"Market sentiment error: {str(e)}")
-        return jsonify({
+        return _jsonify({
             'error': 'Market sentiment analysis failed'
         }), 500
 
@@ -302,7 +682,7 @@ if __name__ == '__main__':
     is_production = os.environ.get('FLASK_ENV') == 'production' or os.environ.get('ENVIRONMENT') == 'production'
     debug_mode = False if is_production else os.environ.get('DEBUG', 'False').lower() == 'true'
     
-    # Run the Flask app
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
     app.run(
         host='0.0.0.0',
         port=int(os.environ.get('PORT', 5001)),
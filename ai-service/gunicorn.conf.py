@@ -0,0 +1,18 @@
+"""
+Gunicorn configuration for the Unlisted Edge AI Service
+Used by `npm run ai:prod`; `python app.py` remains the development server
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5001)}"
+
+# One worker process per CPU, each serving requests on a small thread pool
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+timeout = 30
+keepalive = 5
+accesslog = '-'